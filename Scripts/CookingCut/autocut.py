@@ -1,7 +1,7 @@
+import json
 import time
+import random
 import threading
-import keyboard
-import pyautogui
 
 # ←––––– CONFIG –––––––––––––––––––––––––––––––––––––––––
 FPS            = 30            # your sequence’s framerate
@@ -9,36 +9,342 @@ INTERVAL_SECS  = 0.5           # cut every 0.5s
 DURATION_SECS  = 12 * 60       # total sequence length (seconds)
 TIMEBOX_X      = 1340          # your measured X
 TIMEBOX_Y      = 1312          # your measured Y
+BACKEND        = "pyautogui"   # "pyautogui", "batched" or "simulated"
+CUT_LIST       = ""            # cuts.json from beatcut.py; empty = every INTERVAL_SECS
+
+PREMIERE_TITLE = "Adobe Premiere Pro"  # cuts wait while another window has focus
+FOCUS_POLL     = 0.25          # how often to look for Premiere again while waiting
+VERIFY_PLAYHEAD = True         # pyautogui: read the TC box back before razoring; this is
+                               # what tells the pacer a cut was dropped (off = fixed floor)
+
+# adaptive pacing: the pause after each cut shrinks while Premiere keeps up
+# and backs off as soon as a cut stalls or gets dropped.
+# The batched backend has no way to see a dropped cut (only a send that blocks),
+# so on real runs it effectively holds its floor.
+MIN_DELAY      = 0.005         # fastest we ever go (seconds), simulated backend
+MAX_DELAY      = 0.5           # slowest we back off to, simulated backend
+PYAUTOGUI_MIN_DELAY = 0.02     # the old sleep after each cut, on top of pyautogui.PAUSE
+PYAUTOGUI_MAX_DELAY = 1.0
+BATCHED_MIN_DELAY   = 0.5      # AutoCut.ahk's timer interval
+BATCHED_MAX_DELAY   = 2.0
+CLICK_SETTLE   = 0.05          # pause after clicking into the TC box
+START_DELAY    = 0.05          # where we start (never below the backend's minimum)
+SPEEDUP        = 0.9           # delay *= SPEEDUP after a clean cut
+BACKOFF        = 2.0           # delay *= BACKOFF after a stall / miss
+FLOOR_MARGIN   = 1.1           # don't go below 1.1× the delay that last failed…
+FLOOR_RELAX    = 32            # …until this many clean cuts in a row
+STALL_SECS     = 0.25          # a send that blocks this long means Premiere lags
+REPORT_EVERY   = 0.5           # seconds between progress lines
 # ────────────────────────────────────────────────────────
 
-# how many slices?
-slices = int(DURATION_SECS / INTERVAL_SECS)
+# what a backend reports back for each cut
+CUT_OK      = "ok"       # cut landed
+CUT_STALLED = "stalled"  # cut was sent, but Premiere took too long to take it
+CUT_MISSED  = "missed"   # cut was dropped and has to be sent again
+CUT_WAITING = "waiting"  # nothing sent: Premiere isn't focused, try again shortly
+
+def active_window_title():
+    """Title of the foreground window, or None where we can't tell (non-Windows)."""
+    try:
+        import ctypes
+        user32 = ctypes.windll.user32
+    except (ImportError, AttributeError):
+        return None
+    hwnd = user32.GetForegroundWindow()
+    title = ctypes.create_unicode_buffer(user32.GetWindowTextLengthW(hwnd) + 1)
+    user32.GetWindowTextW(hwnd, title, len(title))
+    return title.value
 
-def sec_to_timecode(t):
-    hh = int(t // 3600)
-    mm = int((t % 3600) // 60)
-    ss = int(t % 60)
-    ff = int((t - int(t)) * FPS)
+def frame_to_timecode(frame, fps=None):
+    fps = FPS if fps is None else fps
+    ss, ff = divmod(int(frame), fps)
+    hh, ss = divmod(ss, 3600)
+    mm, ss = divmod(ss, 60)
     return f"{hh:02d}:{mm:02d}:{ss:02d}:{ff:02d}"
 
-running = False
+def interval_cut_frames():
+    """Frame numbers for the fixed INTERVAL_SECS spacing."""
+    # how many slices?
+    slices = int(DURATION_SECS / INTERVAL_SECS)
+    return [int(round(i * INTERVAL_SECS * FPS)) for i in range(1, slices + 1)]
 
-def cutter():
-    for i in range(1, slices + 1):
-        if not running:
-            break
-        tc = sec_to_timecode(i * INTERVAL_SECS)
+def load_cut_list(path):
+    """Frame numbers from a beatcut.py cut list, checked against our FPS."""
+    with open(path, encoding="utf-8") as f:
+        cut_list = json.load(f)
+    if cut_list["fps"] != FPS:
+        raise ValueError(f"{path} was made for {cut_list['fps']} fps, sequence is {FPS} fps")
+    return sorted(cut_list["frames"])
+
+def cut_frames():
+    return load_cut_list(CUT_LIST) if CUT_LIST else interval_cut_frames()
+
+# --- Cut-driver backends ---
+
+class CutBackend:
+    """
+    Drives Premiere (or a stand-in) one cut at a time.
+    cut(frame) places a razor cut at an absolute sequence frame and returns
+    CUT_OK, CUT_STALLED, CUT_MISSED or CUT_WAITING. now()/sleep() are the clock
+    the cutter loop paces itself with, so the simulated backend can run on
+    virtual time. min_delay / max_delay bound the pacer's pause after a cut
+    (None = MIN_DELAY / MAX_DELAY).
+    """
+    name = "base"
+    min_delay = None
+    max_delay = None
+    send_overhead = 0.0  # time a send takes by design (built-in pauses), not lag
+
+    def cut(self, frame):
+        raise NotImplementedError
+
+    def now(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def close(self):
+        pass
+
+    def premiere_focused(self):
+        title = active_window_title()
+        return title is None or PREMIERE_TITLE in title
+
+    def _timed(self, send):
+        start = self.now()
+        send()
+        lag = self.now() - start - self.send_overhead
+        return CUT_STALLED if lag > STALL_SECS else CUT_OK
+
+class PyAutoGuiBackend(CutBackend):
+    """
+    The original driver: type each timecode into the TC box, then razor.
+    pyautogui's own pause after every call is kept; it is what gives Premiere
+    time to take each step.
+    """
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self.gui = pyautogui
+        self.min_delay = PYAUTOGUI_MIN_DELAY
+        self.max_delay = PYAUTOGUI_MAX_DELAY
+        self.send_overhead = CLICK_SETTLE + 4 * pyautogui.PAUSE  # _goto's pauses
+
+    def cut(self, frame):
+        # another window took focus: don't type into it, retry once Premiere is back
+        if not self.premiere_focused():
+            return CUT_WAITING
+        timecode = frame_to_timecode(frame)
+        status = self._timed(lambda: self._goto(timecode))
+        # the playhead didn't get there (input dropped): skip the razor, send again
+        if VERIFY_PLAYHEAD and self._read_timecode() != timecode:
+            return CUT_MISSED
+        # 3) razor-cut both audio & video
+        self.gui.hotkey('ctrl', 'shift', 'k')
+        return status
+
+    def _goto(self, timecode):
         # 1) click into the TC box
-        pyautogui.click(TIMEBOX_X, TIMEBOX_Y)
-        time.sleep(0.05)
+        self.gui.click(TIMEBOX_X, TIMEBOX_Y)
+        time.sleep(CLICK_SETTLE)
         # 2) select all and type new timecode
-        pyautogui.hotkey('ctrl', 'a')
-        pyautogui.typewrite(tc, interval=0)
-        pyautogui.press('enter')
-        # 3) razor-cut both audio & video
-        pyautogui.hotkey('ctrl', 'shift', 'k')
-        # tiny pause so Premiere can catch up
-        time.sleep(0.02)
+        self.gui.hotkey('ctrl', 'a')
+        self.gui.typewrite(timecode, interval=0)
+        self.gui.press('enter')
+
+    def _read_timecode(self):
+        """What the TC box shows now, copied out through the clipboard."""
+        import pyperclip  # installed with pyautogui
+        self.gui.click(TIMEBOX_X, TIMEBOX_Y)
+        time.sleep(CLICK_SETTLE)
+        self.gui.hotkey('ctrl', 'a')
+        self.gui.hotkey('ctrl', 'c')
+        self.gui.press('esc')
+        return pyperclip.paste().strip().replace(";", ":")
+
+class BatchedKeystrokeBackend(CutBackend):
+    """
+    Like AutoCut.ahk: step the playhead with a whole run of Right presses and
+    razor, all sent as one keystroke sequence. Needs the timeline focused with
+    the playhead parked at frame 0 before starting.
+    """
+    name = "batched"
+
+    def __init__(self):
+        import keyboard
+        self.keyboard = keyboard
+        self.playhead = 0
+        self.min_delay = BATCHED_MIN_DELAY
+        self.max_delay = BATCHED_MAX_DELAY
+
+    def cut(self, frame):
+        if not self.premiere_focused():
+            return CUT_WAITING  # nothing sent, so the playhead hasn't moved
+        step = frame - self.playhead
+        keys = ["right"] * step if step >= 0 else ["left"] * -step
+        status = self._timed(lambda: self.keyboard.send(", ".join(keys + ["ctrl+shift+k"])))
+        self.playhead = frame
+        return status
+
+class SimulatedBackend(CutBackend):
+    """
+    Records cut events against a toy model of Premiere instead of a GUI, on a
+    virtual clock so pacing can be benchmarked and tuned instantly.
+    Each accepted cut keeps Premiere busy for `latency` (± jitter, with an
+    occasional `spike`); a cut sent while it is still busy gets dropped.
+    """
+    name = "simulated"
+
+    def __init__(self, latency=0.012, jitter=0.004, spike_chance=0.01, spike=0.3,
+                 send_cost=0.001, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.spike_chance = spike_chance
+        self.spike = spike
+        self.send_cost = send_cost
+        self.rng = random.Random(seed)
+        self.clock = 0.0
+        self.busy_until = 0.0
+        self.events = []  # (virtual time, frame, status)
+
+    def now(self):
+        return self.clock
+
+    def sleep(self, seconds):
+        self.clock += seconds
+
+    def cut(self, frame):
+        self.clock += self.send_cost
+        if self.clock < self.busy_until:
+            status = CUT_MISSED
+        else:
+            work = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+            if self.rng.random() < self.spike_chance:
+                work += self.spike
+            self.busy_until = self.clock + work
+            status = CUT_OK
+        self.events.append((self.clock, frame, status))
+        return status
+
+BACKENDS = {
+    "pyautogui": PyAutoGuiBackend,
+    "batched": BatchedKeystrokeBackend,
+    "simulated": SimulatedBackend,
+}
+
+# --- Pacing and progress ---
+
+class AdaptivePacer:
+    """
+    Multiplicative speed-up on clean cuts, multiplicative back-off on trouble.
+    The delay that last failed becomes a floor (× FLOOR_MARGIN) we return to
+    once the hiccup is over, and it only relaxes after FLOOR_RELAX clean cuts,
+    so we don't keep probing the same limit and dropping cuts on the way.
+    """
+
+    def __init__(self, start=None, low=None, high=None,
+                 speedup=None, backoff=None, margin=None, relax=None):
+        # unset arguments take the CONFIG values as they are now, not at import
+        self.low = MIN_DELAY if low is None else low
+        self.high = max(self.low, MAX_DELAY if high is None else high)
+        self.delay = max(self.low, START_DELAY if start is None else start)
+        self.speedup = SPEEDUP if speedup is None else speedup
+        self.backoff = BACKOFF if backoff is None else backoff
+        self.margin = FLOOR_MARGIN if margin is None else margin
+        self.relax = FLOOR_RELAX if relax is None else relax
+        self.floor = self.low
+        self.clean = 0
+        self.in_trouble = False
+
+    def update(self, status):
+        if status != CUT_OK:
+            if not self.in_trouble:
+                self.floor = min(self.high, self.delay * self.margin)
+                self.in_trouble = True
+            self.clean = 0
+            self.delay = min(self.high, self.delay * self.backoff)
+        elif self.in_trouble:
+            self.in_trouble = False
+            self.delay = self.floor
+        else:
+            self.clean += 1
+            if self.clean >= self.relax:
+                self.floor = max(self.low, self.floor * self.speedup)
+                self.clean = 0
+            self.delay = max(self.floor, self.delay * self.speedup)
+        return self.delay
+
+class CutStats:
+    """Cuts done, cuts per second, ETA, miss / stall counts and time spent waiting for focus."""
+
+    def __init__(self, total, start):
+        self.total = total
+        self.start = start
+        self.done = 0
+        self.missed = 0
+        self.stalled = 0
+        self.waited = 0.0
+        self.last_report = start
+
+    def record(self, status):
+        if status == CUT_MISSED:
+            self.missed += 1
+            return
+        if status == CUT_STALLED:
+            self.stalled += 1
+        self.done += 1
+
+    def rate(self, now):
+        elapsed = now - self.start - self.waited
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def line(self, now, delay):
+        rate = self.rate(now)
+        eta = (self.total - self.done) / rate if rate else float("inf")
+        return (f"{self.done}/{self.total} cuts | {rate:.1f} cuts/s | ETA {eta:.1f}s | "
+                f"missed {self.missed} | stalled {self.stalled} | waited {self.waited:.1f}s | "
+                f"delay {delay * 1000:.1f}ms")
+
+    def maybe_report(self, now, delay, every=None):
+        every = REPORT_EVERY if every is None else every
+        if now - self.last_report >= every:
+            self.last_report = now
+            print("\r" + self.line(now, delay), end="", flush=True)
+
+running = False
+
+def run_cuts(backend, frames, pacer=None, report=True, should_run=lambda: True):
+    """Feed every frame in `frames` through `backend`, retrying dropped cuts."""
+    pacer = pacer or AdaptivePacer(low=backend.min_delay, high=backend.max_delay)
+    stats = CutStats(len(frames), backend.now())
+    i = 0
+    while i < len(frames) and should_run():
+        status = backend.cut(frames[i])
+        if status == CUT_WAITING:
+            # not Premiere's fault: leave the pacer and the miss count alone
+            backend.sleep(FOCUS_POLL)
+            stats.waited += FOCUS_POLL
+            if report:
+                stats.maybe_report(backend.now(), pacer.delay)
+            continue
+        stats.record(status)
+        if status != CUT_MISSED:
+            i += 1
+        backend.sleep(pacer.update(status))
+        if report:
+            stats.maybe_report(backend.now(), pacer.delay)
+    if report:
+        print("\r" + stats.line(backend.now(), pacer.delay))
+    return stats
+
+def cutter():
+    backend = BACKENDS[BACKEND]()
+    try:
+        run_cuts(backend, cut_frames(), should_run=lambda: running)
+    finally:
+        backend.close()
     print("✅ Done slicing.")
 
 def toggle():
@@ -50,6 +356,30 @@ def toggle():
     else:
         print("⏹ Auto-slice stopped")
 
-print(f"Press F6 to start/stop slicing every {INTERVAL_SECS}s ({int(FPS*INTERVAL_SECS)} frames).")
-keyboard.add_hotkey('F6', toggle)
-keyboard.wait('esc')
+def benchmark(delays=(0.0, 0.005, 0.01, 0.02, 0.05), seed=0):
+    """Compare fixed delays against adaptive pacing on the simulated backend."""
+    frames = cut_frames()
+    print(f"Simulating {len(frames)} cuts")
+    for delay in delays:
+        backend = SimulatedBackend(seed=seed)
+        stats = run_cuts(backend, frames, AdaptivePacer(delay, delay, delay), report=False)
+        print(f"fixed {delay * 1000:5.1f}ms  {stats.line(backend.now(), delay)}")
+    backend = SimulatedBackend(seed=seed)
+    pacer = AdaptivePacer()
+    stats = run_cuts(backend, frames, pacer, report=False)
+    print(f"adaptive      {stats.line(backend.now(), pacer.delay)}")
+
+def main():
+    if BACKEND == "simulated":
+        benchmark()
+        return
+    import keyboard
+    if CUT_LIST:
+        print(f"Press F6 to start/stop slicing at the cuts in {CUT_LIST}.")
+    else:
+        print(f"Press F6 to start/stop slicing every {INTERVAL_SECS}s ({int(FPS*INTERVAL_SECS)} frames).")
+    keyboard.add_hotkey('F6', toggle)
+    keyboard.wait('esc')
+
+if __name__ == "__main__":
+    main()
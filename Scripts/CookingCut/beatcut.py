@@ -0,0 +1,193 @@
+import os
+import json
+import struct
+import time
+import numpy as np
+
+import autocut
+from autocut import frame_to_timecode
+
+# ←––––– CONFIG –––––––––––––––––––––––––––––––––––––––––
+FPS            = autocut.FPS      # frame rate the cut list is snapped to
+WAV_PATH       = "sequence.wav"   # File ▸ Export ▸ Media… ▸ Waveform Audio
+CUT_LIST_PATH  = "cuts.json"      # read by autocut.py (CUT_LIST)
+HOP            = 512              # samples per envelope step
+BLOCK_HOPS     = 4096             # envelope steps read per chunk (~2M samples)
+MIN_GAP_SECS   = 0.25             # never cut closer together than this
+THRESH_WINDOW  = 1.0              # seconds of context for the adaptive threshold
+THRESH_DELTA   = 1.5              # peaks must beat mean + DELTA × std of that window
+PEAK_RADIUS    = 0.05             # a peak is the max within ± this many seconds
+# ────────────────────────────────────────────────────────
+
+WAVE_FORMAT_PCM        = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def read_wav_header(path):
+    """Walk the RIFF chunks and return (format, channels, rate, bits, data offset, data bytes)."""
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"Not a WAV file: {path}")
+        fmt = None
+        while True:
+            head = f.read(8)
+            if len(head) < 8:
+                raise ValueError(f"No data chunk in {path}")
+            chunk_id, size = struct.unpack("<4sI", head)
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == WAVE_FORMAT_EXTENSIBLE:
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"data chunk before fmt chunk in {path}")
+                # some exporters write 0 / 0xFFFFFFFF for huge files; trust the file size then
+                available = os.path.getsize(path) - f.tell()
+                if size == 0 or size > available:
+                    size = available
+                return fmt + (f.tell(), size)
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+class WavStream:
+    """
+    Memory-mapped WAV reader handing out mono float32 blocks, so an hour-long
+    export costs the same memory as a ten-second one.
+    """
+
+    def __init__(self, path):
+        tag, self.channels, self.rate, self.bits, offset, size = read_wav_header(path)
+        width = self.bits // 8
+        self.frames = size // (width * self.channels)
+        if tag == WAVE_FORMAT_IEEE_FLOAT and self.bits in (32, 64):
+            dtype, self.scale = np.dtype(f"<f{width}"), 1.0
+        elif tag == WAVE_FORMAT_PCM and self.bits in (8, 16, 32):
+            dtype = np.dtype("u1") if self.bits == 8 else np.dtype(f"<i{width}")
+            self.scale = 1.0 / 2 ** (self.bits - 1)
+        elif tag == WAVE_FORMAT_PCM and self.bits == 24:
+            dtype, self.scale = np.dtype("u1"), 1.0 / 2 ** 23
+        else:
+            raise ValueError(f"Unsupported WAV format {tag:#x} / {self.bits}-bit in {path}")
+        cols = self.channels * 3 if self.bits == 24 else self.channels
+        self.data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(self.frames, cols))
+
+    def blocks(self, size):
+        for start in range(0, self.frames, size):
+            yield self._mono(self.data[start:start + size])
+
+    def _mono(self, raw):
+        if self.bits == 24:
+            b = raw.reshape(len(raw), self.channels, 3).astype(np.int32)
+            raw = (b[..., 0] | (b[..., 1] << 8) | (b[..., 2] << 16))
+            raw = np.where(raw >= 1 << 23, raw - (1 << 24), raw)
+        elif self.bits == 8:
+            raw = raw.astype(np.int16) - 128
+        # per-channel adds beat raw.mean(axis=1), which is slow on interleaved ints
+        mono = raw[:, 0].astype(np.float32)
+        for c in range(1, raw.shape[1]):
+            mono += raw[:, c]
+        mono *= np.float32(self.scale / raw.shape[1])
+        return mono
+
+def rms(frames):
+    return np.sqrt(np.einsum("ij,ij->i", frames, frames) / frames.shape[1])
+
+def envelopes(stream, hop=None, block_hops=None):
+    """
+    One pass over the file: per-hop RMS energy of the mix and of a
+    pre-emphasised (high-passed) copy, which is where drum hits live.
+    """
+    hop = HOP if hop is None else hop
+    block_hops = BLOCK_HOPS if block_hops is None else block_hops
+    energy, bright = [], []
+    carry = carry_hp = np.zeros(0, np.float32)
+    last = np.float32(0)
+    for block in stream.blocks(hop * block_hops):
+        emphasised = np.empty_like(block)
+        emphasised[0] = block[0] - 0.97 * last
+        emphasised[1:] = block[1:] - 0.97 * block[:-1]
+        last = block[-1]
+        block = np.concatenate((carry, block))
+        emphasised = np.concatenate((carry_hp, emphasised))
+        usable = len(block) // hop * hop
+        energy.append(rms(block[:usable].reshape(-1, hop)))
+        bright.append(rms(emphasised[:usable].reshape(-1, hop)))
+        carry, carry_hp = block[usable:], emphasised[usable:]
+    if not energy:
+        return np.zeros(0, np.float32), np.zeros(0, np.float32)
+    return np.concatenate(energy), np.concatenate(bright)
+
+def onset_strength(energy, bright):
+    """Half-wave rectified rise in log energy, weighted towards the bright band."""
+    log_e = np.log1p(1000 * energy)
+    log_b = np.log1p(1000 * bright)
+    flux = np.maximum(np.diff(log_b, prepend=log_b[:1]), 0)
+    flux += 0.5 * np.maximum(np.diff(log_e, prepend=log_e[:1]), 0)
+    return flux
+
+def moving_mean(x, n):
+    """Centred moving average via cumulative sums (edges use the partial window)."""
+    c = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+    idx = np.arange(len(x))
+    lo = np.clip(idx - n // 2, 0, len(x))
+    hi = np.clip(idx + n // 2 + 1, 0, len(x))
+    return (c[hi] - c[lo]) / (hi - lo)
+
+def pick_cuts(strength, hop_secs, fps=None, min_gap=None):
+    """Adaptive-threshold peak picking, snapped to frames and thinned to min_gap."""
+    fps = FPS if fps is None else fps
+    min_gap = MIN_GAP_SECS if min_gap is None else min_gap
+    if len(strength) == 0:
+        return []
+    window = max(1, int(THRESH_WINDOW / hop_secs))
+    mean = moving_mean(strength, window)
+    std = np.sqrt(np.maximum(moving_mean(strength ** 2, window) - mean ** 2, 0))
+    radius = max(1, int(PEAK_RADIUS / hop_secs))
+    padded = np.pad(strength, radius, mode="edge")
+    local_max = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1).max(axis=1)
+    peaks = np.flatnonzero((strength >= local_max) & (strength > mean + THRESH_DELTA * std))
+
+    # strongest first, drop anything within min_gap of a cut we already kept
+    gap_frames = max(1, int(round(min_gap * fps)))
+    frames = np.rint(peaks * hop_secs * fps).astype(np.int64)
+    taken = np.zeros(frames.max() + gap_frames + 1 if len(frames) else 1, bool)
+    kept = []
+    for i in np.argsort(strength[peaks])[::-1]:
+        f = frames[i]
+        if f <= 0 or taken[max(0, f - gap_frames + 1):f + gap_frames].any():
+            continue
+        taken[f] = True
+        kept.append(int(f))
+    return sorted(kept)
+
+def analyze(path, fps=None):
+    """Cut frames for the WAV at `path`."""
+    # settings are read at call time, so tyscripts overrides applied after import count
+    fps = FPS if fps is None else fps
+    stream = WavStream(path)
+    energy, bright = envelopes(stream)
+    return pick_cuts(onset_strength(energy, bright), HOP / stream.rate, fps)
+
+def write_cut_list(frames, path, fps=None, source=None):
+    fps = FPS if fps is None else fps
+    cut_list = {
+        "fps": fps,
+        "source": source,
+        "frames": frames,
+        "timecodes": [frame_to_timecode(f, fps) for f in frames],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cut_list, f, indent=1)
+
+def main():
+    start = time.perf_counter()
+    frames = analyze(WAV_PATH)
+    elapsed = time.perf_counter() - start
+    write_cut_list(frames, CUT_LIST_PATH, source=os.path.basename(WAV_PATH))
+    print(f"✅ {len(frames)} cuts from {WAV_PATH} in {elapsed * 1000:.0f}ms → {CUT_LIST_PATH}")
+
+if __name__ == "__main__":
+    main()
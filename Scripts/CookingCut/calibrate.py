@@ -1,3 +1,27 @@
-import pyautogui, time
-time.sleep(5)
-print(pyautogui.position())
+import keyboard
+import pyautogui
+
+# ←––––– CONFIG –––––––––––––––––––––––––––––––––––––––––
+CAPTURE_KEY = 'F8'    # press while hovering the spot to measure
+QUIT_KEY    = 'esc'
+# ────────────────────────────────────────────────────────
+
+def capture(key=CAPTURE_KEY):
+    """Block until `key` is pressed and return the mouse position at that moment."""
+    keyboard.wait(key, suppress=True)
+    return pyautogui.position()
+
+def capture_timebox(key=CAPTURE_KEY):
+    """One position for autocut.py's TIMEBOX_X / TIMEBOX_Y."""
+    print(f"Hover over Premiere's timecode box and press {key}.")
+    x, y = capture(key)
+    print(f"TIMEBOX_X = {x}\nTIMEBOX_Y = {y}")
+    return x, y
+
+def main():
+    print(f"Press {CAPTURE_KEY} to print the mouse position, {QUIT_KEY} to quit.")
+    keyboard.add_hotkey(CAPTURE_KEY, lambda: print(tuple(pyautogui.position())), suppress=True)
+    keyboard.wait(QUIT_KEY)
+
+if __name__ == "__main__":
+    main()
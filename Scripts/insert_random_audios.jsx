@@ -30,6 +30,19 @@
         return null;
     }
 
+    // optional plan from plan_inserts.py: { names: [...], clips: [[nameIndex, startSecs], ...] }
+    // Cancel the dialog to fall back to shuffling inside Premiere.
+    function loadPlan(kind) {
+        var planFile = File.openDialog("Select placement_plan.json (Cancel = shuffle here)", "*.json");
+        if (!planFile) { return null; }
+        planFile.encoding = "UTF-8";
+        if (!planFile.open("r")) { alert("❌ Could not open " + planFile.fsName); return null; }
+        var text = planFile.read();
+        planFile.close();
+        var plan = eval("(" + text + ")");     // ExtendScript has no JSON object
+        return plan[kind] || null;
+    }
+
     // collect all .mp3 or .wav items in that bin (non-recursive)
     function findAudioItems(bin) {
         for (var i = 0; i < bin.children.numItems; i++) {
@@ -52,12 +65,22 @@
     findAudioItems(audioBin);
     if (!audioItems.length) { alert("❌ No .mp3 or .wav items in the 'audios' bin."); return; }
 
-    // shuffle (Fisher-Yates)
-    for (var i = audioItems.length - 1; i > 0; i--) {
-        var j   = Math.floor(Math.random() * (i + 1));
-        var tmp = audioItems[i];
-        audioItems[i] = audioItems[j];
-        audioItems[j] = tmp;
+    var plan = loadPlan("audio");
+    var itemsByName = {};
+    for (var n = 0; n < audioItems.length; n++) { itemsByName[audioItems[n].name] = audioItems[n]; }
+
+    if (!plan) {
+        // shuffle (Fisher-Yates)
+        for (var i = audioItems.length - 1; i > 0; i--) {
+            var j   = Math.floor(Math.random() * (i + 1));
+            var tmp = audioItems[i];
+            audioItems[i] = audioItems[j];
+            audioItems[j] = tmp;
+        }
+    } else {
+        for (n = 0; n < plan.names.length; n++) {
+            if (!itemsByName[plan.names[n]]) { alert("❌ '" + plan.names[n] + "' from the plan is not in the 'audios' bin."); return; }
+        }
     }
 
     // ────────────────────────────────────────────────────────────────────────────
@@ -73,6 +96,14 @@
     var audioTrack = sequence.audioTracks[1];   // A2
     var timeCursor = 0.0;
 
+    if (plan) {
+        // the plan already has every start time; just apply it
+        for (i = 0; i < plan.clips.length; i++) {
+            audioTrack.insertClip(itemsByName[plan.names[plan.clips[i][0]]], plan.clips[i][1]);
+        }
+        return;
+    }
+
     for (i = 0; i < audioItems.length; i++) {
         var clipItem = audioItems[i];
         audioTrack.insertClip(clipItem, timeCursor);
@@ -35,36 +35,65 @@
         return;
     }
 
-    // Shuffle (Fisher–Yates)
-    for (var i = mp4Items.length - 1; i > 0; i--) {
-        var j = Math.floor(Math.random() * (i + 1));
-        var tmp = mp4Items[i];
-        mp4Items[i] = mp4Items[j];
-        mp4Items[j] = tmp;
+    // Helper: optional plan from plan_inserts.py: { names: [...], clips: [[nameIndex, startSecs], ...] }
+    // Cancel the dialog to fall back to shuffling inside Premiere.
+    function loadPlan(kind) {
+        var planFile = File.openDialog("Select placement_plan.json (Cancel = shuffle here)", "*.json");
+        if (!planFile) { return null; }
+        planFile.encoding = "UTF-8";
+        if (!planFile.open("r")) { alert("Could not open " + planFile.fsName); return null; }
+        var text = planFile.read();
+        planFile.close();
+        var plan = eval("(" + text + ")"); // ExtendScript has no JSON object
+        return plan[kind] || null;
+    }
+
+    var itemsByName = {};
+    for (var n = 0; n < mp4Items.length; n++) { itemsByName[mp4Items[n].name] = mp4Items[n]; }
+
+    // Build the (item, start) list: from the plan, or shuffled back-to-back
+    var placements = [];
+    var plan = loadPlan("video");
+    if (plan) {
+        for (n = 0; n < plan.names.length; n++) {
+            if (!itemsByName[plan.names[n]]) { alert("'" + plan.names[n] + "' from the plan is not in the project."); return; }
+        }
+        for (n = 0; n < plan.clips.length; n++) {
+            placements.push([itemsByName[plan.names[plan.clips[n][0]]], plan.clips[n][1]]);
+        }
+    } else {
+        // Shuffle (Fisher–Yates)
+        for (var i = mp4Items.length - 1; i > 0; i--) {
+            var j = Math.floor(Math.random() * (i + 1));
+            var tmp = mp4Items[i];
+            mp4Items[i] = mp4Items[j];
+            mp4Items[j] = tmp;
+        }
+        var timeCursor = 0;
+        for (i = 0; i < mp4Items.length; i++) {
+            placements.push([mp4Items[i], timeCursor]);
+            timeCursor += ticksToSeconds(mp4Items[i].duration);
+        }
     }
 
     // Insert video‐only on V1
     var videoTrack = sequence.videoTracks[0];
-    var timeCursor = 0;
-    for (i = 0; i < mp4Items.length; i++) {
-    // for (i = 0; i < 40; i++) {
-        var clipItem = mp4Items[i];
-        var vClip   = videoTrack.insertClip(clipItem, timeCursor);
-        var seconds = ticksToSeconds(clipItem.duration);
+    var inserted   = {};
+    for (i = 0; i < placements.length; i++) {
+        videoTrack.insertClip(placements[i][0], placements[i][1]);
+        inserted[placements[i][0].nodeId] = true;
+    }
 
-        // strip any leftover linked audio for this clip
-        for (var a = 0; a < sequence.audioTracks.numTracks; a++) {
-            var at = sequence.audioTracks[a];
-            for (var c = at.clips.numItems - 1; c >= 0; c--) {
-                var ac = at.clips[c];
-                if (ac.projectItem === clipItem) {
-                    if (ac.isLinked()) ac.unlink();
-                    ac.remove();
-                }
+    // strip the linked audio of everything we inserted, in one pass at the end
+    for (var a = 0; a < sequence.audioTracks.numTracks; a++) {
+        var at = sequence.audioTracks[a];
+        for (var c = at.clips.numItems - 1; c >= 0; c--) {
+            var ac = at.clips[c];
+            if (ac.projectItem && inserted[ac.projectItem.nodeId]) {
+                if (ac.isLinked()) ac.unlink();
+                ac.remove();
             }
         }
-
-        timeCursor += seconds;
     }
 
         // ────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,184 @@
+import os
+import io
+import json
+import time
+import wave
+import random
+import struct
+import subprocess
+
+# ←––––– CONFIG –––––––––––––––––––––––––––––––––––––––––
+AUDIO_FOLDER   = "audios"                 # same files as the Premiere "audios" bin
+VIDEO_FOLDER   = "videos"                 # .mp4s for insert_random_mp4_video_only.jsx
+TARGET_SECS    = 3 * 60 * 60              # fill this much per track; 0 = every file once
+SEED           = 1                        # same seed + same files = same plan
+PLAN_PATH      = "placement_plan.json"    # pick this file in the .jsx scripts
+CACHE_PATH     = "durations_cache.json"   # probed durations, keyed by path + mtime
+AUDIO_EXTS     = (".mp3", ".wav")
+VIDEO_EXTS     = (".mp4",)
+# ────────────────────────────────────────────────────────
+
+# --- Duration probing ---
+
+def wav_duration(path):
+    with wave.open(path, "rb") as w:
+        return w.getnframes() / w.getframerate()
+
+def mp4_duration(path):
+    """Read duration straight from the moov/mvhd box, no decoder needed."""
+    with open(path, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        while f.tell() < end:
+            head = f.read(8)
+            if len(head) < 8:
+                raise ValueError(f"Truncated box header in {path}")
+            size, kind = struct.unpack(">I4s", head)
+            header = 8
+            if size == 1:
+                large = f.read(8)
+                if len(large) < 8:
+                    raise ValueError(f"Truncated box header in {path}")
+                size = struct.unpack(">Q", large)[0]
+                header = 16
+            elif size == 0:
+                size = end - f.tell() + header
+            if size < header:
+                raise ValueError(f"Corrupt {kind!r} box (size {size}) in {path}")
+            if kind == b"moov":
+                end = f.tell() + size - header  # descend into moov
+                continue
+            if kind == b"mvhd":
+                body = f.read(min(size - header, 32))
+                fields = ">QQIQ" if body[:1] == b"\x01" else ">IIII"  # version 1: 64-bit times
+                if len(body) < 4 + struct.calcsize(fields):
+                    raise ValueError(f"Truncated mvhd box in {path}")
+                _, _, timescale, duration = struct.unpack_from(fields, body, 4)
+                if not timescale:
+                    raise ValueError(f"mvhd timescale is 0 in {path}")
+                return duration / timescale
+            f.seek(size - header, io.SEEK_CUR)
+    raise ValueError(f"No mvhd box in {path}")
+
+def ffprobe_duration(path):
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip())
+
+def probe_duration(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".wav":
+        return wav_duration(path)
+    if ext in (".mp4", ".m4a", ".mov"):
+        return mp4_duration(path)
+    return ffprobe_duration(path)
+
+# --- Duration cache ---
+
+def load_cache(path=None):
+    path = CACHE_PATH if path is None else path
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_cache(cache, path=None):
+    path = CACHE_PATH if path is None else path
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+
+def scan_durations(folder, exts, cache):
+    """{file name: seconds} for every matching file, probing only new or changed ones."""
+    durations = {}
+    if not os.path.isdir(folder):
+        print(f"Warning: folder not found: {folder}")
+        return durations
+    for entry in os.scandir(folder):
+        if not entry.is_file() or not entry.name.lower().endswith(exts):
+            continue
+        key = os.path.abspath(entry.path)
+        st = entry.stat()
+        hit = cache.get(key)
+        if hit and hit["mtime"] == st.st_mtime and hit["size"] == st.st_size:
+            seconds = hit["duration"]
+        else:
+            try:
+                seconds = probe_duration(entry.path)
+            except (OSError, ValueError, subprocess.CalledProcessError, wave.Error) as e:
+                print(f"Warning: could not probe {entry.name}: {e}")
+                continue
+            cache[key] = {"mtime": st.st_mtime, "size": st.st_size, "duration": seconds}
+        if seconds > 0:
+            durations[entry.name] = seconds
+    return durations
+
+# --- Planning ---
+
+def plan_track(durations, target_secs, rng):
+    """
+    Back-to-back (name, start) placements: reshuffled decks of every file until
+    target_secs is filled (or one deck when target_secs is 0), never placing
+    the same file twice in a row.
+    """
+    names = sorted(durations)
+    placements = []
+    cursor = 0.0
+    last = None
+    while names:
+        deck = names[:]
+        rng.shuffle(deck)
+        if last is not None and len(deck) > 1 and deck[0] == last:
+            swap = rng.randrange(1, len(deck))
+            deck[0], deck[swap] = deck[swap], deck[0]
+        for name in deck:
+            if target_secs and cursor >= target_secs:
+                return placements
+            placements.append((name, cursor))
+            cursor += durations[name]
+            last = name
+        if not target_secs:
+            break
+    return placements
+
+def compact_track(placements, durations):
+    """Names stored once; each clip is [name index, start seconds]."""
+    names = sorted({name for name, _ in placements})
+    index = {name: i for i, name in enumerate(names)}
+    end = placements[-1][1] + durations[placements[-1][0]] if placements else 0.0
+    return {
+        "names": names,
+        "clips": [[index[name], round(start, 6)] for name, start in placements],
+        "length": round(end, 6),
+    }
+
+def build_plan(target_secs=None, seed=None):
+    # read at call time, so settings applied after import (tyscripts) take effect
+    target_secs = TARGET_SECS if target_secs is None else target_secs
+    seed = SEED if seed is None else seed
+    cache = load_cache()
+    audio = scan_durations(AUDIO_FOLDER, AUDIO_EXTS, cache)
+    video = scan_durations(VIDEO_FOLDER, VIDEO_EXTS, cache)
+    save_cache(cache)
+    # one generator per track, so changing the audio files leaves the video plan alone
+    return {
+        "seed": seed,
+        "target": target_secs,
+        "audio": compact_track(plan_track(audio, target_secs, random.Random(f"{seed}:audio")), audio),
+        "video": compact_track(plan_track(video, target_secs, random.Random(f"{seed}:video")), video),
+    }
+
+def main():
+    start = time.perf_counter()
+    plan = build_plan()
+    elapsed = time.perf_counter() - start
+    with open(PLAN_PATH, "w", encoding="utf-8") as f:
+        json.dump(plan, f, separators=(",", ":"))
+    for kind in ("audio", "video"):
+        track = plan[kind]
+        print(f"{kind}: {len(track['clips'])} clips from {len(track['names'])} files, "
+              f"{track['length'] / 3600:.2f}h")
+    print(f"✅ Plan written to {PLAN_PATH} in {elapsed * 1000:.0f}ms")
+
+if __name__ == "__main__":
+    main()
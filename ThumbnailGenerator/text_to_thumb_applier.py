@@ -1,12 +1,26 @@
 import os
 import io
+import json
+import math
 import random
+import sys
+import threading
+import traceback
+import zlib
+from multiprocessing import Pool, resource_tracker, shared_memory
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageChops, ImageOps
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# dedupe.py and perceptual_encode.py live in the repo root; imported only when enabled
+REPO_ROOT = os.path.dirname(BASE_DIR)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
 # === CONFIGURATION ===
 INPUT_FOLDER = 'images'
 OUTPUT_FOLDER = 'output_images'
-FONT_PATH = './fonts/ArefRuqaa-Bold.ttf'
+FONT_PATH = os.path.join(BASE_DIR, 'fonts', 'ArefRuqaa-Bold.ttf')
 
 # Text settings
 #LINE1_TEXT = 'Deutsche Lieder'
@@ -16,12 +30,29 @@ LINE2_TEXT = 'Playlist'
 BASE_FONT_SIZE = 200
 LINE_SPACING = 10
 
+# Near-duplicate backgrounds (re-exports, almost identical frames): render one per group
+DEDUPE = False
+DEDUPE_THRESHOLD = 8            # max differing hash bits (of 64)
+DEDUPE_KEEP = 'largest'         # 'largest', 'newest' or 'first'
+
+# Render workers (one design per task); 1 = render everything in this process
+WORKERS = os.cpu_count() or 1
+
 # File size thresholds (in bytes)
 TWO_MB = 2 * 1024 * 1024            # 2 MB threshold
 TARGET_SIZE = int(1.8 * 1024 * 1024)  # target ~1.8 MB
 
-# Ensure output folder exists
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+# JPEG encoding: 'size' = highest quality under TARGET_SIZE (4:4:4);
+# 'perceptual' = lowest quality / subsampling reaching TARGET_SSIM, still under TARGET_SIZE
+ENCODE_MODE = 'size'
+TARGET_SSIM = 0.995
+ENCODE_LOG = 'encode_log.jsonl'       # per-output settings, written next to the outputs
+
+# Animation settings (short looping intros / animated previews)
+ANIMATE = False                 # also render ANIMATED_DESIGNS for every image
+ANIMATION_FRAMES = 60
+ANIMATION_FPS = 30
+ANIMATION_FORMAT = 'webp'       # 'webp', 'apng' or 'png' (numbered PNG sequence)
 
 # --- Helper Functions for Cropping and Saving ---
 
@@ -40,23 +71,40 @@ def crop_to_aspect(image, target_aspect=16/9):
         top = (h - new_height) // 2
         return image.crop((0, top, w, top + new_height))
 
-def save_with_max_size(image, output_path, size_threshold=TWO_MB, target_size=TARGET_SIZE, start_quality=95):
+def save_with_max_size(image, output_path, size_threshold=None, target_size=None, start_quality=95):
     """
     Save the given image (JPEG) to output_path. If the file is larger than size_threshold,
     iteratively reduce JPEG quality until the file size is ≤ target_size.
     Also, disable chroma subsampling (forcing 4:4:4) for crisp edges.
+    With ENCODE_MODE = 'perceptual' the settings come from perceptual_encode instead.
+    The chosen settings are appended to ENCODE_LOG either way.
     """
-    quality = start_quality
-    buffer = io.BytesIO()
-    image.save(buffer, format="JPEG", quality=quality, subsampling=0, optimize=True)
-    file_size = len(buffer.getvalue())
-    while file_size > target_size and quality > 10:
-        quality -= 5
+    size_threshold = TWO_MB if size_threshold is None else size_threshold
+    target_size = TARGET_SIZE if target_size is None else target_size
+    if ENCODE_MODE == 'perceptual':
+        import perceptual_encode
+        data, info = perceptual_encode.encode_for_quality(image, TARGET_SSIM, max_bytes=target_size)
+    else:
+        quality = start_quality
         buffer = io.BytesIO()
         image.save(buffer, format="JPEG", quality=quality, subsampling=0, optimize=True)
         file_size = len(buffer.getvalue())
+        while file_size > target_size and quality > 10:
+            quality -= 5
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality, subsampling=0, optimize=True)
+            file_size = len(buffer.getvalue())
+        data = buffer.getvalue()
+        info = {'mode': 'size', 'quality': quality, 'subsampling': '4:4:4', 'bytes': len(data)}
     with open(output_path, "wb") as f:
-        f.write(buffer.getvalue())
+        f.write(data)
+    record_encode(output_path, info)
+
+def record_encode(output_path, info):
+    """Append one JSON line per output; appends are safe across render workers."""
+    folder, name = os.path.split(output_path)
+    with open(os.path.join(folder, ENCODE_LOG), "a", encoding="utf-8") as f:
+        f.write(json.dumps(dict(info, file=name)) + "\n")
 
 # --- Helper Functions for Text Rendering ---
 
@@ -87,19 +135,26 @@ def add_final_crisp_text(composite, pos1, pos2, crisp_color):
     return Image.alpha_composite(composite, crisp_layer)
 
 # --- Load and Scale Fonts ---
-font_line1 = ImageFont.truetype(FONT_PATH, BASE_FONT_SIZE)
-dummy_img = Image.new('RGBA', (10, 10))
-dummy_draw = ImageDraw.Draw(dummy_img)
-bbox1 = dummy_draw.textbbox((0, 0), LINE1_TEXT, font=font_line1)
-width1 = bbox1[2] - bbox1[0]
-height1 = bbox1[3] - bbox1[1]
-temp_font_line2 = ImageFont.truetype(FONT_PATH, BASE_FONT_SIZE)
-bbox2 = dummy_draw.textbbox((0, 0), LINE2_TEXT, font=temp_font_line2)
-width2 = bbox2[2] - bbox2[0]
-scale_factor = width1 / width2 if width2 != 0 else 1
-font_line2 = ImageFont.truetype(FONT_PATH, int(BASE_FONT_SIZE * scale_factor))
-bbox2 = dummy_draw.textbbox((0, 0), LINE2_TEXT, font=font_line2)
-height2 = bbox2[3] - bbox2[1]
+# Loaded by load_fonts() (from main() and in each render worker), not on import.
+font_line1 = font_line2 = None
+width1 = height1 = height2 = 0
+
+def load_fonts():
+    """Load the line fonts, scaling line 2 so it is as wide as line 1."""
+    global font_line1, font_line2, width1, height1, height2
+    font_line1 = ImageFont.truetype(FONT_PATH, BASE_FONT_SIZE)
+    dummy_img = Image.new('RGBA', (10, 10))
+    dummy_draw = ImageDraw.Draw(dummy_img)
+    bbox1 = dummy_draw.textbbox((0, 0), LINE1_TEXT, font=font_line1)
+    width1 = bbox1[2] - bbox1[0]
+    height1 = bbox1[3] - bbox1[1]
+    temp_font_line2 = ImageFont.truetype(FONT_PATH, BASE_FONT_SIZE)
+    bbox2 = dummy_draw.textbbox((0, 0), LINE2_TEXT, font=temp_font_line2)
+    width2 = bbox2[2] - bbox2[0]
+    scale_factor = width1 / width2 if width2 != 0 else 1
+    font_line2 = ImageFont.truetype(FONT_PATH, int(BASE_FONT_SIZE * scale_factor))
+    bbox2 = dummy_draw.textbbox((0, 0), LINE2_TEXT, font=font_line2)
+    height2 = bbox2[3] - bbox2[1]
 
 # --- DESIGN FUNCTIONS ---
 # We are using designs 1, 2, 4, 5, and 7.
@@ -701,30 +756,380 @@ def add_vignette(image):
     
     return Image.alpha_composite(image, vignette)
 
+# --- ANIMATION ---
+# Animated designs take (layers, t) with t in [0, 1) over one loop. Everything that
+# doesn't move (base, text mask, flare sprite, solid fills, blurs per radius) comes
+# from the AnimationLayers cache, so each frame only pays for what actually changes.
+
+class AnimationLayers:
+    """Frame-coherent layer cache for one base image."""
+
+    def __init__(self, base_image):
+        self.base = base_image
+        self.size = base_image.size
+        self.pos1, self.pos2 = get_text_positions(self.size, width1, height1, height2)
+        self.text_mask = render_text_mask(self.size, self.pos1, self.pos2)
+        self._cache = {}
+
+    def get(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def solid(self, rgb):
+        return self.get(('solid', rgb), lambda: Image.new('RGBA', self.size, rgb))
+
+    def glow_mask(self, blur, offset=(0, 0)):
+        """Text mask blurred by an integer radius and shifted; one blur per distinct radius."""
+        return self.get(('glow', blur, offset), lambda: ImageChops.offset(
+            self.text_mask.filter(ImageFilter.GaussianBlur(blur)), *offset))
+
+    def crisp_text(self, color):
+        def build():
+            layer = Image.new('RGBA', self.size, color[:3] + (0,))
+            layer.putalpha(self.text_mask.point(lambda v: v * color[3] // 255))
+            return layer
+        return self.get(('crisp', color), build)
+
+def scale_alpha(mask, alpha):
+    """Scale an L mask by alpha/255 through a lookup table (cheap per frame)."""
+    return mask.point([v * alpha // 255 for v in range(256)])
+
+def pulse(t):
+    """0 → 1 → 0 over one loop."""
+    return 0.5 - 0.5 * math.cos(2 * math.pi * t)
+
+def animated_neon_pulse(layers, t):
+    """design_style_clickbait_neon with breathing glows and a flare sweeping along the text."""
+    size = layers.size
+    p = pulse(t)
+    overlay = Image.new('RGBA', size, (0, 0, 0, 0))
+    neon_layers = [
+        {'color': (255,   0, 255, 150), 'blur': 8,  'offset': (0, 0)},   # Hot pink core glow
+        {'color': (  0, 255, 255, 120), 'blur': 16, 'offset': (3, 3)},   # Electric cyan outer glow
+    ]
+    for layer in neon_layers:
+        blur = round(layer['blur'] * (0.75 + 0.5 * p))
+        alpha = round(layer['color'][3] * (0.6 + 0.4 * p))
+        glow = layers.solid(layer['color'][:3]).copy()
+        glow.putalpha(scale_alpha(layers.glow_mask(blur, layer['offset']), alpha))
+        overlay = Image.alpha_composite(overlay, glow)
+
+    # flare sprite drawn once, then added at its position for this frame
+    flare = layers.get('flare', make_flare_sprite)
+    w2 = layers.get('line2_width', lambda: font_line2.getmask(LINE2_TEXT).size[0])
+    start_x, end_x = layers.pos1[0], layers.pos2[0] + w2
+    x = int(start_x + (end_x - start_x) * t) - flare.width // 2
+    y = int(layers.pos1[1] + (layers.pos2[1] - layers.pos1[1]) * t) - flare.height // 2
+    box = (x, y, x + flare.width, y + flare.height)
+    overlay.paste(ImageChops.add(overlay.crop(box), flare), box[:2])
+
+    composite = Image.alpha_composite(layers.base, overlay)
+    return Image.alpha_composite(composite, layers.crisp_text((255, 165, 0, 255)))
+
+def make_flare_sprite():
+    """The clickbait-neon lens flare on its own small, pre-blurred tile."""
+    r = 30 + 10  # largest flare ring plus room for the blur
+    sprite = Image.new('RGBA', (2 * r, 2 * r), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    for radius, alpha in [(5, 60), (15, 30), (30, 10)]:
+        draw.ellipse((r - radius, r - radius, r + radius, r + radius), fill=(255, 255, 255, alpha))
+    return sprite.filter(ImageFilter.GaussianBlur(5))
+
+def animated_gold_shimmer(layers, t):
+    """design_style_17's engraved gold with a highlight band sweeping across the letters."""
+    size = layers.size
+
+    def build_static():
+        overlay = Image.new('RGBA', size, (245, 240, 230, 60))
+        for i in range(1, 3):
+            shadow = layers.crisp_text((0, 0, 0, 80))
+            shadow = ImageChops.offset(shadow, i, i).filter(ImageFilter.GaussianBlur(3 * i))
+            overlay = Image.alpha_composite(overlay, shadow)
+        return Image.alpha_composite(layers.base, overlay)
+
+    def build_band():
+        # two widths of gradient so any horizontal phase can be cropped out of it
+        w, h = size
+        profile = Image.new('L', (2 * w, 1))
+        profile.putdata([int(255 * max(0.0, 1 - abs((x % w) / w - 0.5) * 6)) for x in range(2 * w)])
+        return ImageOps.colorize(profile.resize((2 * w, h)), (150, 130, 0), (255, 246, 193))
+
+    band = layers.get('gold_band', build_band)
+    shift = int(size[0] * (1 - t))
+    gold = band.crop((shift, 0, shift + size[0], size[1])).convert('RGBA')
+    gold.putalpha(layers.text_mask)
+    return Image.alpha_composite(layers.get('gold_static', build_static), gold)
+
+ANIMATED_DESIGNS = [
+    animated_neon_pulse,
+    animated_gold_shimmer,
+]
+
+def _chunk(tag, data):
+    return len(data).to_bytes(4, 'big') + tag + data + zlib.crc32(tag + data).to_bytes(4, 'big')
+
+class ApngWriter:
+    """Writes APNG frames as they arrive; only the current frame is ever held."""
+
+    def __init__(self, path, frame_count, fps):
+        self.file = open(path, 'wb')
+        self.frame_count = frame_count
+        self.fps = fps
+        self.sequence = 0
+        self.file.write(b'\x89PNG\r\n\x1a\n')
+
+    def add(self, frame):
+        buffer = io.BytesIO()
+        frame.save(buffer, format='PNG', compress_level=3)
+        data = buffer.getvalue()
+        pos, idat = 8, []
+        while pos < len(data):
+            length = int.from_bytes(data[pos:pos + 4], 'big')
+            tag = data[pos + 4:pos + 8]
+            body = data[pos + 8:pos + 8 + length]
+            if tag == b'IHDR' and self.sequence == 0:
+                self.file.write(_chunk(tag, body))
+                self.file.write(_chunk(b'acTL', self.frame_count.to_bytes(4, 'big') + bytes(4)))
+            elif tag == b'IDAT':
+                idat.append(body)
+            pos += 12 + length
+        w, h = frame.size
+        fctl = (self.sequence.to_bytes(4, 'big') + w.to_bytes(4, 'big') + h.to_bytes(4, 'big')
+                + bytes(8) + (1).to_bytes(2, 'big') + self.fps.to_bytes(2, 'big') + bytes(2))
+        first = self.sequence == 0
+        self.file.write(_chunk(b'fcTL', fctl))
+        self.sequence += 1
+        for body in idat:
+            if first:
+                self.file.write(_chunk(b'IDAT', body))
+            else:
+                self.file.write(_chunk(b'fdAT', self.sequence.to_bytes(4, 'big') + body))
+                self.sequence += 1
+
+    def close(self):
+        self.file.write(_chunk(b'IEND', b''))
+        self.file.close()
+
+class WebpWriter:
+    """Writes an animated WebP frame by frame (ANMF chunks), patching the RIFF size on close."""
+
+    def __init__(self, path, frame_count, fps, quality=90):
+        self.file = open(path, 'wb')
+        self.duration = round(1000 / fps)
+        self.quality = quality
+        self.started = False
+        self.file.write(b'RIFF\0\0\0\0WEBP')
+
+    def _write(self, tag, data):
+        pad = b'\0' if len(data) & 1 else b''
+        self.file.write(tag + len(data).to_bytes(4, 'little') + data + pad)
+
+    def add(self, frame):
+        w, h = frame.size
+        if not self.started:
+            # VP8X with the animation flag, then ANIM (transparent background, loop forever)
+            self._write(b'VP8X', b'\x02\0\0\0' + (w - 1).to_bytes(3, 'little') + (h - 1).to_bytes(3, 'little'))
+            self._write(b'ANIM', bytes(4) + (0).to_bytes(2, 'little'))
+            self.started = True
+        buffer = io.BytesIO()
+        frame.convert('RGB').save(buffer, format='WEBP', quality=self.quality)
+        data = buffer.getvalue()
+        pos, bitstream = 12, b''
+        while pos < len(data):
+            length = int.from_bytes(data[pos + 4:pos + 8], 'little')
+            end = pos + 8 + length + (length & 1)
+            if data[pos:pos + 4] in (b'ALPH', b'VP8 ', b'VP8L'):
+                bitstream += data[pos:end]
+            pos = end
+        header = (bytes(6) + (w - 1).to_bytes(3, 'little') + (h - 1).to_bytes(3, 'little')
+                  + self.duration.to_bytes(3, 'little') + b'\x02')  # no blending, no disposal
+        self._write(b'ANMF', header + bitstream)
+
+    def close(self):
+        size = self.file.tell() - 8
+        self.file.seek(4)
+        self.file.write(size.to_bytes(4, 'little'))
+        self.file.close()
+
+class PngSequenceWriter:
+    """Numbered PNGs: name-000.png, name-001.png, ..."""
+
+    def __init__(self, path, frame_count, fps):
+        self.stem = os.path.splitext(path)[0]
+        self.index = 0
+
+    def add(self, frame):
+        frame.save(f"{self.stem}-{self.index:03d}.png", compress_level=3)
+        self.index += 1
+
+    def close(self):
+        pass
+
+ANIMATION_WRITERS = {
+    'webp': ('.webp', WebpWriter),
+    'apng': ('.png', ApngWriter),
+    'png': ('.png', PngSequenceWriter),
+}
+
+def animate_design(base_image, animated_design, output_path, frames=None, fps=None, fmt=None, layers=None):
+    """
+    Render one loop of animated_design and stream it to output_path frame by frame.
+    frames / fps / fmt default to the ANIMATION_* settings as they are when called.
+    """
+    frames = ANIMATION_FRAMES if frames is None else frames
+    fps = ANIMATION_FPS if fps is None else fps
+    fmt = ANIMATION_FORMAT if fmt is None else fmt
+    layers = layers or AnimationLayers(base_image)
+    writer = ANIMATION_WRITERS[fmt][1](output_path, frames, fps)
+    try:
+        for i in range(frames):
+            writer.add(animated_design(layers, i / frames).convert('RGB'))
+    finally:
+        writer.close()
+
+
+# --- Shared-memory fan-out to render workers ---
+# Each preprocessed base (crop_to_aspect + add_vignette) is copied into shared memory
+# once; workers wrap it read-only with Image.frombuffer instead of unpickling tens of
+# megabytes per design. The segment is unlinked when its last task has finished.
+
+class SharedBase:
+    """A preprocessed RGBA base in shared memory, reference-counted by pending tasks."""
+
+    def __init__(self, image, users, on_free=None):
+        data = image.tobytes()
+        self.shm = shared_memory.SharedMemory(create=True, size=len(data))
+        self.shm.buf[:len(data)] = data
+        self.size = image.size
+        self.users = users
+        self.on_free = on_free
+        self.lock = threading.Lock()
+
+    def release(self):
+        with self.lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+        self.shm.close()
+        self.shm.unlink()
+        if self.on_free:
+            self.on_free()
+
+def settings():
+    """This module's configuration constants, to hand to worker processes."""
+    return {k: v for k, v in globals().items()
+            if k.isupper() and isinstance(v, (str, int, float, bool, tuple))}
+
+def _init_worker(config):
+    globals().update(config)
+    load_fonts()
+
+def render_design(base_image, design, output_path):
+    save_with_max_size(design(base_image).convert('RGB'), output_path)
+
+def _render_from_shared(shm_name, size, render, design, output_path):
+    """Worker side: attach, render straight from the shared pixels, detach."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    base_image = None
+    try:
+        base_image = Image.frombuffer('RGBA', size, shm.buf, 'raw', 'RGBA', 0, 1)
+        render(base_image, design, output_path)
+    except BaseException as error:
+        # the failed design's frames still hold the image; free them so close() can go through
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        base_image = None  # drop the buffer export before closing the mapping
+        shm.close()
+    return output_path
+
+def load_base(input_path):
+    base_image = Image.open(input_path).convert('RGBA')
+    # Preprocessing steps
+    base_image = crop_to_aspect(base_image, target_aspect=16/9)
+    return add_vignette(base_image)  # Apply vignette to all images
+
+def render_jobs(index, designs):
+    """(render, design, output filename) for every output of image number `index`."""
+    jobs = [(render_design, design, f"image-{index}-{style_index}.jpg")
+            for style_index, design in enumerate(designs, start=1)]
+    if ANIMATE:
+        ext = ANIMATION_WRITERS[ANIMATION_FORMAT][0]
+        jobs += [(animate_design, design, f"anim-{index}-{anim_index}{ext}")
+                 for anim_index, design in enumerate(ANIMATED_DESIGNS, start=1)]
+    return jobs
+
+def run_parallel(files, designs, workers=None):
+    workers = WORKERS if workers is None else workers
+    # at most workers + 1 bases live in shared memory: one being prepared, the rest rendering
+    slots = threading.BoundedSemaphore(workers + 1)
+    errors = []
+    if os.name == 'posix':
+        # start the tracker before forking so workers share it: their attach doesn't
+        # register the segments a second time, and our unlink is the only cleanup
+        resource_tracker.ensure_running()
+    with Pool(workers, initializer=_init_worker, initargs=(settings(),)) as pool:
+        pending = []
+        for index, filename in enumerate(files, start=1):
+            jobs = render_jobs(index, designs)
+            slots.acquire()
+            try:
+                shared = SharedBase(load_base(os.path.join(INPUT_FOLDER, filename)), len(jobs), slots.release)
+            except Exception:
+                slots.release()
+                raise
+
+            for render, design, output_filename in jobs:
+                def done(output_path, shared=shared):
+                    shared.release()
+                    print(f"Saved: {os.path.basename(output_path)}")
+
+                def failed(error, shared=shared):
+                    shared.release()
+                    errors.append(error)
+
+                pending.append(pool.apply_async(
+                    _render_from_shared,
+                    (shared.shm.name, shared.size, render, design, os.path.join(OUTPUT_FOLDER, output_filename)),
+                    callback=done, error_callback=failed))
+        for result in pending:
+            result.wait()
+    if errors:
+        raise errors[0]
+
 # --- Modified Main Loop ---
 def main():
     files = [f for f in os.listdir(INPUT_FOLDER) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
+    if DEDUPE:
+        import dedupe
+        files = dedupe.unique_files(INPUT_FOLDER, files, DEDUPE_THRESHOLD, DEDUPE_KEEP)
+    if not files:
+        return
+
+    # Ensure output folder exists
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+    load_fonts()
     
     designs = [
         design_style_2,
         design_style_5,
         design_style_clickbait_neon
     ]
-    
+
+    if WORKERS > 1:
+        run_parallel(files, designs)
+        return
+
     for index, filename in enumerate(files, start=1):
-        input_path = os.path.join(INPUT_FOLDER, filename)
-        base_image = Image.open(input_path).convert('RGBA')
-        
-        # Preprocessing steps
-        base_image = crop_to_aspect(base_image, target_aspect=16/9)
-        base_image = add_vignette(base_image)  # Apply vignette to all images
-        
-        for style_index, design in enumerate(designs, start=1):
-            result = design(base_image)  # Designs get vignetted image
-            output_filename = f"image-{index}-{style_index}.jpg"
+        base_image = load_base(os.path.join(INPUT_FOLDER, filename))
+        layers = AnimationLayers(base_image) if ANIMATE else None
+        for render, design, output_filename in render_jobs(index, designs):
             output_path = os.path.join(OUTPUT_FOLDER, output_filename)
-            final_image = result.convert('RGB')
-            save_with_max_size(final_image, output_path)
+            if render is animate_design:
+                animate_design(base_image, design, output_path, layers=layers)
+            else:
+                render(base_image, design, output_path)
             print(f"Saved: {output_filename}")
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+# /dedupe.py
+# Perceptual near-duplicate detection shared by ThumbnailGenerator and resizer.
+
+import os
+import json
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+INDEX_NAME = '.phash_index.json'   # kept next to the images it describes
+HASH_METHOD = 'phash'              # 'phash' (DCT, sturdier) or 'dhash' (gradient, cheaper)
+THRESHOLD = 8                      # max differing bits (of 64) to count as a duplicate
+KEEP = 'largest'                   # which file of a group to render: 'largest', 'newest' or 'first'
+
+# --- Hashing (8x8 = 64-bit hashes on a small grayscale copy) ---
+
+def _small_gray(path, size):
+    img = Image.open(path)
+    img.draft('L', (size[0] * 4, size[1] * 4))  # JPEG: let the decoder downscale for us
+    return np.asarray(img.convert('L').resize(size, Image.BOX, reducing_gap=2.0), dtype=np.float32)
+
+def _pack(bits):
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), 'big')
+
+def dhash(path):
+    """Is each pixel brighter than its right-hand neighbour, on a 9x8 thumbnail."""
+    px = _small_gray(path, (9, 8))
+    return _pack(px[:, 1:] > px[:, :-1])
+
+_DCT = None
+
+def phash(path):
+    """Low-frequency 8x8 DCT coefficients of a 32x32 thumbnail against their median."""
+    global _DCT
+    if _DCT is None:
+        k = np.arange(32)
+        _DCT = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / 64).astype(np.float32)
+    low = (_DCT @ _small_gray(path, (32, 32)) @ _DCT.T)[:8, :8]
+    return _pack(low > np.median(low.ravel()[1:]))
+
+HASHERS = {'dhash': dhash, 'phash': phash}
+
+def hamming(h, hashes):
+    """Bit distance from one hash to an array of uint64 hashes."""
+    x = np.bitwise_xor(hashes, np.uint64(h))
+    return np.unpackbits(x.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+# --- Persistent index ---
+
+def load_index(path, method):
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('method') == method:
+            return index['files']
+    return {}
+
+def save_index(path, method, entries):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'method': method, 'files': entries}, f, indent=1, sort_keys=True)
+
+def hash_folder(folder, files, method=HASH_METHOD):
+    """
+    {file name: index entry} for `files` in `folder`. Only new or changed files
+    (by mtime and size) get decoded; everything else comes from the index.
+    """
+    index_path = os.path.join(folder, INDEX_NAME)
+    cached = load_index(index_path, method)
+    entries = {}
+    for name in files:
+        path = os.path.join(folder, name)
+        st = os.stat(path)
+        entry = cached.get(name)
+        if not entry or entry['mtime'] != st.st_mtime or entry['size'] != st.st_size:
+            try:
+                with Image.open(path) as img:
+                    width, height = img.size
+                entry = {'mtime': st.st_mtime, 'size': st.st_size, 'width': width,
+                         'height': height, 'hash': f"{HASHERS[method](path):016x}"}
+            except (UnidentifiedImageError, OSError):
+                print(f"Warning: Could not hash image: {path}")
+                continue
+        entries[name] = entry
+    if entries != cached:
+        save_index(index_path, method, entries)
+    return entries
+
+# --- Grouping ---
+
+LOSSLESS_EXTS = ('.png', '.bmp', '.tif', '.tiff')
+
+def _preference(entries, keep):
+    names = sorted(entries)
+    if keep == 'largest':
+        # same pixel count: lossless before lossy, then the bigger (less compressed) file
+        return sorted(names, key=lambda n: (-entries[n]['width'] * entries[n]['height'],
+                                            not n.lower().endswith(LOSSLESS_EXTS),
+                                            -entries[n]['size']))
+    if keep == 'newest':
+        return sorted(names, key=lambda n: -entries[n]['mtime'])
+    return names
+
+def group_near_duplicates(entries, threshold=THRESHOLD, keep=KEEP):
+    """
+    [(representative, [(duplicate, distance), ...]), ...]. Files are visited in
+    `keep` order and join the closest group whose representative is within
+    `threshold` bits, so each representative is the preferred file of its group.
+    """
+    reps = np.zeros(len(entries), dtype=np.uint64)
+    groups = []
+    for name in _preference(entries, keep):
+        h = int(entries[name]['hash'], 16)
+        if groups:
+            dist = hamming(h, reps[:len(groups)])
+            best = int(np.argmin(dist))
+            if dist[best] <= threshold:
+                groups[best][1].append((name, int(dist[best])))
+                continue
+        reps[len(groups)] = h
+        groups.append((name, []))
+    return groups
+
+def unique_files(folder, files, threshold=THRESHOLD, keep=KEEP, method=HASH_METHOD):
+    """Drop near-duplicates from `files` (order kept), reporting what was skipped."""
+    entries = hash_folder(folder, files, method)
+    groups = group_near_duplicates(entries, threshold, keep)
+    kept = {rep for rep, _ in groups} | {f for f in files if f not in entries}
+    skipped = 0
+    for rep, dups in groups:
+        for name, dist in dups:
+            print(f"Skipped near-duplicate: {name} (≈ {rep}, distance {dist})")
+            skipped += 1
+    if skipped:
+        print(f"Rendering {len(kept)} of {len(files)} inputs ({skipped} near-duplicates skipped)")
+    return [f for f in files if f in kept]
@@ -0,0 +1,165 @@
+# /perceptual_encode.py
+# Pick the cheapest JPEG settings that still look like the original (SSIM on luma,
+# with a chroma check for subsampling), without ever going over a byte cap.
+# Shared by ThumbnailGenerator and resizer.
+
+import io
+import numpy as np
+from PIL import Image
+
+TARGET_SSIM = 0.995        # mean luma SSIM the encode has to reach
+CHROMA_TARGET = 0.99       # Cb/Cr SSIM a subsampled pick must keep, else the next subsampling wins
+MIN_QUALITY = 40
+MAX_QUALITY = 95
+FLOOR_QUALITY = 10         # below MIN_QUALITY only to get under the byte cap, as size mode does
+SUBSAMPLINGS = (2, 0)      # 4:2:0 first (smaller), then 4:4:4 (crisper colour edges)
+SCORE_WIDTH = 480          # scored at roughly this width (1/4 of 1920 via the decoder's draft scale)
+SSIM_WINDOW = 8
+
+SUBSAMPLING_NAMES = {0: '4:4:4', 1: '4:2:2', 2: '4:2:0'}
+
+C1 = (0.01 * 255) ** 2
+C2 = (0.03 * 255) ** 2
+
+def _blocks(luma, k=SSIM_WINDOW):
+    """Non-overlapping k×k blocks as a (rows, cols, k*k) float32 array."""
+    h, w = luma.shape[0] // k * k, luma.shape[1] // k * k
+    x = luma[:h, :w].reshape(h // k, k, w // k, k).swapaxes(1, 2)
+    return np.ascontiguousarray(x, dtype=np.float32).reshape(h // k, w // k, k * k)
+
+def _stats(blocks):
+    mean = blocks.mean(axis=2)
+    return mean, (blocks * blocks).mean(axis=2) - mean * mean
+
+def ssim(a, b, k=SSIM_WINDOW):
+    """Mean SSIM of two same-sized luma arrays (0..255) over k×k blocks."""
+    return _ssim(_blocks(a, k), _stats(_blocks(a, k)), _blocks(b, k))
+
+def _ssim(ref_blocks, ref_stats, blocks):
+    mu_a, var_a = ref_stats
+    mu_b, var_b = _stats(blocks)
+    cov = np.einsum('ijk,ijk->ij', ref_blocks, blocks) / blocks.shape[2] - mu_a * mu_b
+    num = (2 * mu_a * mu_b + C1) * (2 * cov + C2)
+    den = (mu_a * mu_a + mu_b * mu_b + C1) * (var_a + var_b + C2)
+    return float(np.mean(num / den))
+
+class Scorer:
+    """
+    Scores encoded JPEG bytes against a reference by luma SSIM. Candidates are decoded
+    straight to grayscale at 1/2, 1/4 or 1/8 size by the JPEG decoder (draft mode),
+    which is far cheaper than a full decode + resize. The reference is a quality-100
+    4:4:4 encode decoded the same way, so both sides go through identical scaling;
+    its block statistics are computed once. chroma() does the same for Cb and Cr and
+    is only called for the few encodes that decide the subsampling.
+    """
+
+    def __init__(self, image, width=SCORE_WIDTH):
+        scale = 1
+        while scale < 8 and image.width // (scale * 2) >= width:
+            scale *= 2
+        self.draft_size = (image.width // scale, image.height // scale)
+        self.reference = encode(image, 100, 0)
+        self.luma = self._prepare([self._decode(self.reference, 'L')])[0]
+        self.chroma_reference = None
+
+    def _decode(self, data, mode):
+        decoded = Image.open(io.BytesIO(data))
+        decoded.draft(mode, self.draft_size)
+        return np.asarray(decoded if decoded.mode == mode else decoded.convert(mode))
+
+    @staticmethod
+    def _prepare(planes):
+        return [(blocks, _stats(blocks)) for blocks in map(_blocks, planes)]
+
+    def score(self, data):
+        blocks, stats = self.luma
+        return _ssim(blocks, stats, _blocks(self._decode(data, 'L')))
+
+    def chroma(self, data):
+        """The worse of the Cb and Cr SSIMs."""
+        if self.chroma_reference is None:
+            ycbcr = self._decode(self.reference, 'YCbCr')
+            self.chroma_reference = self._prepare(np.moveaxis(ycbcr, 2, 0)[1:])
+        planes = np.moveaxis(self._decode(data, 'YCbCr'), 2, 0)[1:]
+        return min(_ssim(blocks, stats, _blocks(plane))
+                   for (blocks, stats), plane in zip(self.chroma_reference, planes))
+
+def encode(image, quality, subsampling, optimize=False):
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, subsampling=subsampling, optimize=optimize)
+    return buffer.getvalue()
+
+def encode_for_quality(image, target=TARGET_SSIM, max_bytes=None, min_quality=MIN_QUALITY,
+                       max_quality=MAX_QUALITY, subsamplings=SUBSAMPLINGS, chroma_target=CHROMA_TARGET):
+    """
+    Smallest JPEG of `image` scoring at least `target` luma SSIM and fitting in max_bytes.
+    Binary-searches quality per subsampling; a chroma-subsampled pick must also keep
+    chroma_target on Cb/Cr, or the next-smallest one is taken. If nothing reaches the
+    target under the cap, the best-scoring encode that fits wins. If not even
+    min_quality fits, quality keeps stepping down to FLOOR_QUALITY until it does (the
+    smallest encode otherwise).
+    Returns (bytes, info) with the chosen quality, subsampling, score and size.
+    """
+    image = image.convert('RGB')
+    scorer = Scorer(image)
+    tried = {}
+
+    def attempt(quality, subsampling):
+        key = (quality, subsampling)
+        if key not in tried:
+            data = encode(image, quality, subsampling)
+            tried[key] = (len(data), scorer.score(data), data)
+        return tried[key]
+
+    for subsampling in subsamplings:
+        lo, hi = min_quality, max_quality
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if attempt(mid, subsampling)[1] >= target:
+                hi = mid
+            else:
+                lo = mid + 1
+        attempt(lo, subsampling)
+
+    def fits(key):
+        return max_bytes is None or tried[key][0] <= max_bytes
+
+    if not any(fits(key) for key in tried):
+        quality, subsampling = min(tried, key=lambda key: tried[key][0])
+        while quality > FLOOR_QUALITY and not fits((quality, subsampling)):
+            quality = max(FLOOR_QUALITY, quality - 5)
+            attempt(quality, subsampling)
+
+    meeting = [key for key, (size, score, _) in tried.items() if score >= target and fits(key)]
+    if meeting:
+        meeting.sort(key=lambda key: tried[key][0])
+        for quality, subsampling in meeting:
+            # chroma is only checked here, on the few picks that are otherwise good enough
+            if subsampling == 0 or scorer.chroma(tried[(quality, subsampling)][2]) >= chroma_target:
+                break
+        else:
+            quality, subsampling = meeting[0]
+    elif any(fits(key) for key in tried):
+        quality, subsampling = max((key for key in tried if fits(key)), key=lambda key: tried[key][1])
+    else:
+        quality, subsampling = min(tried, key=lambda key: tried[key][0])
+
+    # optimize=True: same pixels, smaller Huffman tables. Pillow gives optimized saves
+    # below q95 a width×height byte buffer, which busy images overflow (OSError), so
+    # those keep the scored bytes as they are.
+    data = tried[(quality, subsampling)][2]
+    if len(data) < image.width * image.height:
+        try:
+            data = encode(image, quality, subsampling, optimize=True)
+        except OSError:
+            pass
+    info = {
+        'mode': 'perceptual',
+        'quality': quality,
+        'subsampling': SUBSAMPLING_NAMES[subsampling],
+        'ssim': round(tried[(quality, subsampling)][1], 5),
+        'target': target,
+        'bytes': len(data),
+        'encodes': len(tried) + 1,
+    }
+    return data, info
@@ -1,6 +1,8 @@
 # /resizer/resize.py
 
 import os
+import sys
+import json
 from PIL import Image, UnidentifiedImageError, ImageFilter
 import io
 
@@ -9,6 +11,11 @@ INPUT_DIR = os.path.join(BASE_DIR, 'input')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
 BRAND_PATH = os.path.join(BASE_DIR, 'brand.png')
 
+# dedupe.py and perceptual_encode.py live in the repo root; imported only when enabled
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
 MAX_SIZE_MB = 1.75
 MAX_SIZE_BYTES = int(MAX_SIZE_MB * 1024 * 1024)
 
@@ -18,6 +25,16 @@ CANVAS_HEIGHT = 1080
 BRAND_PADDING = 30
 BRAND_SCALE = 0.1  # Adjust this to change how big the logo is (as % of canvas width)
 
+# JPEG encoding: 'size' = highest quality under MAX_SIZE_MB;
+# 'perceptual' = lowest quality / subsampling reaching TARGET_SSIM, still under MAX_SIZE_MB
+ENCODE_MODE = 'size'
+TARGET_SSIM = 0.995
+ENCODE_LOG = 'encode_log.jsonl'   # per-output settings, written to OUTPUT_DIR
+
+DEDUPE = False              # render one input per group of near-duplicates
+DEDUPE_THRESHOLD = 8        # max differing hash bits (of 64)
+DEDUPE_KEEP = 'largest'     # 'largest', 'newest' or 'first'
+
 def ensure_directories():
     os.makedirs(INPUT_DIR, exist_ok=True)
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -74,35 +91,52 @@ def compress_to_jpeg_with_glow(img_path, brand_logo):
     img_final = make_16_9_glow(img)
     img_final = add_brand_logo(img_final, brand_logo)
 
+    if ENCODE_MODE == 'perceptual':
+        import perceptual_encode
+        return perceptual_encode.encode_for_quality(img_final, TARGET_SSIM, max_bytes=MAX_SIZE_BYTES)
+
     quality = 95
     step = 5
 
     while quality >= 20:
         buffer = io.BytesIO()
-        img_final.save(buffer, format="JPEG", quality=quality, optimize=True)
+        img_final.save(buffer, format="JPEG", quality=quality, subsampling=2, optimize=True)
         if buffer.tell() <= MAX_SIZE_BYTES:
-            return buffer.getvalue()
+            return buffer.getvalue(), size_info(quality, buffer.tell())
         quality -= step
 
     # Fallback
     buffer = io.BytesIO()
-    img_final.save(buffer, format="JPEG", quality=quality, optimize=True)
-    return buffer.getvalue()
+    img_final.save(buffer, format="JPEG", quality=quality, subsampling=2, optimize=True)
+    return buffer.getvalue(), size_info(quality, buffer.tell())
+
+def size_info(quality, size):
+    # subsampling=2 is Pillow's default for these saves, spelled out so the log can say so
+    return {'mode': 'size', 'quality': quality, 'subsampling': '4:2:0', 'bytes': size}
+
+def record_encode(output_filename, info):
+    with open(os.path.join(OUTPUT_DIR, ENCODE_LOG), 'a', encoding='utf-8') as f_log:
+        f_log.write(json.dumps(dict(info, file=output_filename)) + '\n')
 
 def main():
     ensure_directories()
     brand_logo = load_brand_logo()
     files = [f for f in os.listdir(INPUT_DIR) if f.lower().endswith('.png')]
     files.sort()
+    if DEDUPE:
+        import dedupe
+        files = dedupe.unique_files(INPUT_DIR, files, DEDUPE_THRESHOLD, DEDUPE_KEEP)
 
     for idx, filename in enumerate(files, start=1):
         input_path = os.path.join(INPUT_DIR, filename)
-        image_data = compress_to_jpeg_with_glow(input_path, brand_logo)
-        if image_data:
+        encoded = compress_to_jpeg_with_glow(input_path, brand_logo)
+        if encoded:
+            image_data, encode_info = encoded
             output_filename = f"Thumb-{idx}.jpg"
             output_path = os.path.join(OUTPUT_DIR, output_filename)
             with open(output_path, 'wb') as f_out:
                 f_out.write(image_data)
+            record_encode(output_filename, encode_info)
             print(f"Saved: {output_filename}")
         else:
             print(f"Skipped: {filename}")
@@ -0,0 +1,250 @@
+# /tyscripts.py
+# One entry point for every tool: python tyscripts.py <command> [options]
+# Only argparse/json are imported up front; each command imports its tool (and
+# with it PIL, NumPy or the GUI automation modules) when it actually runs.
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+
+_T0 = time.perf_counter()
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CONFIG = 'tyscripts.json'
+
+# command -> (folder, module) of the tool it drives
+TOOLS = {
+    'thumb': ('ThumbnailGenerator', 'text_to_thumb_applier'),
+    'resize': ('resizer', 'resize'),
+    'autocut': ('Scripts/CookingCut', 'autocut'),
+    'beats': ('Scripts/CookingCut', 'beatcut'),
+    'plan-audio': ('Scripts', 'plan_inserts'),
+    'calibrate': ('Scripts/CookingCut', 'calibrate'),
+}
+
+def load_tool(command):
+    folder, name = TOOLS[command]
+    path = os.path.join(ROOT, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(name)
+
+# --- Config: tyscripts.json sections, then --set, then dedicated flags ---
+
+def read_config(path):
+    """{command: {CONSTANT: value}}; a missing default config is just empty."""
+    if not os.path.exists(path):
+        if path != DEFAULT_CONFIG:
+            raise SystemExit(f"Config file not found: {path}")
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def parse_set(items):
+    """NAME=VALUE pairs; VALUE is read as JSON when it parses, else as a string."""
+    settings = {}
+    for item in items:
+        name, sep, value = item.partition('=')
+        if not sep:
+            raise SystemExit(f"--set expects NAME=VALUE, got {item!r}")
+        try:
+            settings[name] = json.loads(value)
+        except ValueError:
+            settings[name] = value
+    return settings
+
+def apply_settings(module, settings):
+    for name, value in settings.items():
+        if not name.isupper() or not hasattr(module, name):
+            raise SystemExit(f"{module.__name__} has no setting {name}")
+        setattr(module, name, value)
+
+def collect_settings(args, flags):
+    """Config section, then --set, then whichever dedicated flags were given."""
+    settings = dict(read_config(args.config).get(args.command, {}))
+    settings.update(parse_set(args.set))
+    for dest, name in flags.items():
+        value = getattr(args, dest)
+        if value is not None:
+            settings[name] = value
+    return settings
+
+# --- Commands ---
+
+THUMB_FLAGS = {
+    'input': 'INPUT_FOLDER', 'output': 'OUTPUT_FOLDER', 'font': 'FONT_PATH',
+    'line1': 'LINE1_TEXT', 'line2': 'LINE2_TEXT', 'workers': 'WORKERS',
+    'animate': 'ANIMATE', 'animation_format': 'ANIMATION_FORMAT', 'dedupe': 'DEDUPE',
+    'encode': 'ENCODE_MODE', 'target_ssim': 'TARGET_SSIM',
+}
+RESIZE_FLAGS = {
+    'input': 'INPUT_DIR', 'output': 'OUTPUT_DIR', 'brand': 'BRAND_PATH',
+    'max_mb': 'MAX_SIZE_MB', 'dedupe': 'DEDUPE',
+    'encode': 'ENCODE_MODE', 'target_ssim': 'TARGET_SSIM',
+}
+AUTOCUT_FLAGS = {
+    'backend': 'BACKEND', 'fps': 'FPS', 'interval': 'INTERVAL_SECS',
+    'duration': 'DURATION_SECS', 'cut_list': 'CUT_LIST',
+}
+BEATS_FLAGS = {'wav': 'WAV_PATH', 'out': 'CUT_LIST_PATH', 'fps': 'FPS', 'min_gap': 'MIN_GAP_SECS'}
+PLAN_FLAGS = {
+    'audio': 'AUDIO_FOLDER', 'video': 'VIDEO_FOLDER', 'seed': 'SEED',
+    'out': 'PLAN_PATH', 'cache': 'CACHE_PATH',
+}
+
+def cmd_thumb(args, timer):
+    settings = collect_settings(args, THUMB_FLAGS)
+    tool = timer.load('thumb')
+    apply_settings(tool, settings)
+    tool.main()
+
+def cmd_resize(args, timer):
+    settings = collect_settings(args, RESIZE_FLAGS)
+    tool = timer.load('resize')
+    if 'MAX_SIZE_MB' in settings:
+        settings['MAX_SIZE_BYTES'] = int(settings['MAX_SIZE_MB'] * 1024 * 1024)
+    apply_settings(tool, settings)
+    tool.main()
+
+def cmd_autocut(args, timer):
+    settings = collect_settings(args, AUTOCUT_FLAGS)
+    if args.timebox:
+        settings['TIMEBOX_X'], settings['TIMEBOX_Y'] = args.timebox
+    tool = timer.load('autocut')
+    apply_settings(tool, settings)
+    if args.benchmark:
+        tool.benchmark()
+    else:
+        tool.main()
+
+def cmd_beats(args, timer):
+    settings = collect_settings(args, BEATS_FLAGS)
+    tool = timer.load('beats')
+    apply_settings(tool, settings)
+    tool.main()
+
+def cmd_plan_audio(args, timer):
+    settings = collect_settings(args, PLAN_FLAGS)
+    if args.target_hours is not None:
+        settings['TARGET_SECS'] = args.target_hours * 3600
+    tool = timer.load('plan-audio')
+    apply_settings(tool, settings)
+    tool.main()
+
+def cmd_calibrate(args, timer):
+    settings = collect_settings(args, {'key': 'CAPTURE_KEY'})
+    tool = timer.load('calibrate')
+    apply_settings(tool, settings)
+    if not args.save:
+        tool.main()
+        return
+    x, y = tool.capture_timebox(tool.CAPTURE_KEY)
+    config = read_config(args.config)
+    config.setdefault('autocut', {}).update({'TIMEBOX_X': x, 'TIMEBOX_Y': y})
+    with open(args.config, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+    print(f"Saved to {args.config}")
+
+# --- Parser ---
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='tyscripts', description="Thumbnail, resize and Premiere helper tools.")
+    parser.add_argument('--config', default=DEFAULT_CONFIG,
+                        help=f"JSON file with one section of settings per command (default: {DEFAULT_CONFIG})")
+    parser.add_argument('--timings', action='store_true', help="print startup / import / run times to stderr")
+    sub = parser.add_subparsers(dest='command', required=True, metavar='command')
+
+    def add(name, func, help):
+        p = sub.add_parser(name, help=help, description=help)
+        p.set_defaults(func=func)
+        p.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                       help="override any of the tool's CONFIG constants (repeatable)")
+        return p
+
+    def add_dedupe(p):
+        p.add_argument('--dedupe', action=argparse.BooleanOptionalAction, default=None,
+                       help="skip near-duplicate inputs (off unless set here or in the config)")
+
+    def add_encode(p):
+        p.add_argument('--encode', choices=['size', 'perceptual'],
+                       help="JPEG settings: best quality under the size cap, or smallest file at --target-ssim")
+        p.add_argument('--target-ssim', type=float, help="quality bar for --encode perceptual")
+
+    p = add('thumb', cmd_thumb, "Render text designs onto background images.")
+    p.add_argument('--input', help="folder of backgrounds")
+    p.add_argument('--output', help="folder for the rendered thumbnails")
+    p.add_argument('--font')
+    p.add_argument('--line1')
+    p.add_argument('--line2')
+    p.add_argument('--workers', type=int, help="render processes (1 = no pool)")
+    p.add_argument('--animate', action='store_true', default=None, help="also render animated loops")
+    p.add_argument('--animation-format', choices=['webp', 'apng', 'png'])
+    add_dedupe(p)
+    add_encode(p)
+
+    p = add('resize', cmd_resize, "Fit PNGs onto a 16:9 glow canvas with the brand logo.")
+    p.add_argument('--input')
+    p.add_argument('--output')
+    p.add_argument('--brand', help="logo PNG")
+    p.add_argument('--max-mb', type=float, help="size cap per JPEG")
+    add_dedupe(p)
+    add_encode(p)
+
+    p = add('autocut', cmd_autocut, "Razor the active Premiere sequence at fixed or beat-driven points.")
+    p.add_argument('--backend', choices=['pyautogui', 'batched', 'simulated'])
+    p.add_argument('--fps', type=int)
+    p.add_argument('--interval', type=float, help="seconds between cuts")
+    p.add_argument('--duration', type=float, help="sequence length in seconds")
+    p.add_argument('--cut-list', help="cuts.json from the beats command")
+    p.add_argument('--timebox', type=int, nargs=2, metavar=('X', 'Y'), help="timecode box position")
+    p.add_argument('--benchmark', action='store_true', help="compare pacing on the simulated backend")
+
+    p = add('beats', cmd_beats, "Find cut points in a WAV export.")
+    p.add_argument('wav', nargs='?')
+    p.add_argument('--out', help="cut list to write")
+    p.add_argument('--fps', type=int, help="frame rate to snap cuts to (must match the sequence)")
+    p.add_argument('--min-gap', type=float, help="seconds between cuts at least")
+
+    p = add('plan-audio', cmd_plan_audio, "Plan the random audio/video inserts offline.")
+    p.add_argument('--audio', help="audio folder")
+    p.add_argument('--video', help="video folder")
+    p.add_argument('--target-hours', type=float, help="length to fill per track (0 = every file once)")
+    p.add_argument('--seed', type=int)
+    p.add_argument('--out', help="plan file to write")
+    p.add_argument('--cache', help="duration cache file")
+
+    p = add('calibrate', cmd_calibrate, "Capture screen positions with a hotkey.")
+    p.add_argument('--key', help="capture hotkey (default F8)")
+    p.add_argument('--save', action='store_true',
+                   help="capture the timecode box once and store it in the config for autocut")
+    return parser
+
+class Timer:
+    """Splits a run into CLI startup, tool import and the command itself."""
+
+    def __init__(self):
+        self.imports = 0.0
+
+    def load(self, command):
+        start = time.perf_counter()
+        tool = load_tool(command)
+        self.imports += time.perf_counter() - start
+        return tool
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    timer = Timer()
+    start = time.perf_counter()
+    try:
+        args.func(args, timer)
+    finally:
+        if args.timings:
+            run = time.perf_counter() - start - timer.imports
+            print(f"startup {(start - _T0) * 1000:.1f}ms | import {timer.imports * 1000:.1f}ms | "
+                  f"run {run * 1000:.1f}ms", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()